@@ -1,21 +1,51 @@
 import os
-import uuid
 import json
 import sys
+import queue
+import hashlib
+import functools
+import logging
+import logging.handlers
+import threading
 import subprocess
-from flask import Flask, request, jsonify, render_template, url_for
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from flask import (Flask, request, jsonify, render_template, url_for, Response,
+                   send_file, copy_current_request_context, has_request_context)
 from dotenv import load_dotenv
 
+# Hot emotion-bucketing helpers; transparently replaced by the mypyc-built
+# extension when one has been compiled (see emotion_fast.py)
+from emotion_fast import vader_result, textblob_result
+
 # Emotion Analysis Imports
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 try:
-    from transformers import pipeline
+    from transformers import pipeline, AutoTokenizer
     HF_AVAILABLE = True
     print("Hugging Face transformers loaded successfully")
 except ImportError:
     HF_AVAILABLE = False
     print("Hugging Face transformers not available. Install with: pip install transformers torch")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    print("orjson loaded successfully")
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("orjson not available. Install with: pip install orjson")
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+    print("ONNX Runtime loaded successfully")
+except ImportError:
+    ONNX_AVAILABLE = False
+    print("ONNX Runtime not available. Install with: pip install onnxruntime")
+
 try:
     from textblob import TextBlob
     TEXTBLOB_AVAILABLE = True
@@ -52,9 +82,71 @@ except ImportError:
     GOOGLE_CLOUD_AVAILABLE = False
     print("Google Cloud TTS not available")
 
+# --- Connection Pooling for gTTS ---
+# gTTS opens a fresh TLS connection to Google per synthesis; on short texts
+# the TCP+TLS handshake dominates latency. Swap the 'requests' name inside
+# gtts.tts for a proxy that routes traffic through one pooled Session.
+if GTTS_AVAILABLE:
+    import requests
+    import gtts.tts
+    from requests.adapters import HTTPAdapter
+
+    _GTTS_SESSION = requests.Session()
+    _gtts_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+    _GTTS_SESSION.mount('https://', _gtts_adapter)
+    _GTTS_SESSION.mount('http://', _gtts_adapter)
+
+    class _NonClosingSession:
+        """Wraps the shared session so 'with requests.Session()' blocks in
+        gtts can't tear down the connection pool on exit"""
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def close(self):
+            pass
+
+        def __getattr__(self, name):
+            return getattr(_GTTS_SESSION, name)
+
+    class _PooledRequests:
+        """Module stand-in routing gtts HTTP calls through the shared pool"""
+        def get(self, *args, **kwargs):
+            return _GTTS_SESSION.get(*args, **kwargs)
+
+        def post(self, *args, **kwargs):
+            return _GTTS_SESSION.post(*args, **kwargs)
+
+        def Session(self):
+            return _NonClosingSession()
+
+        def __getattr__(self, name):
+            return getattr(requests, name)
+
+    gtts.tts.requests = _PooledRequests()
+    print("gTTS connection pooling enabled")
+
 # --- Load Environment Variables ---
 load_dotenv()
 
+# --- Logging ---
+# Per-request messages go through a queue so log I/O never blocks request
+# threads on the stdout lock; a background listener drains to disk. At the
+# default INFO level the per-synthesis debug lines are skipped entirely.
+_LOG_QUEUE = queue.Queue(-1)
+logger = logging.getLogger('empathy_engine')
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+logger.addHandler(logging.handlers.QueueHandler(_LOG_QUEUE))
+
+_log_file_handler = logging.FileHandler(os.getenv('LOG_FILE', 'app.log'))
+_log_file_handler.setFormatter(
+    logging.Formatter('%(asctime)s %(levelname)s %(threadName)s %(message)s')
+)
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _log_file_handler)
+_LOG_LISTENER.start()
+
 # --- Configuration ---
 class Config:
     # Emotion Analysis Engine Options: 'vader', 'huggingface', 'textblob', 'ensemble'
@@ -66,10 +158,62 @@ class Config:
     
     # API Keys
     GOOGLE_CLOUD_KEY_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+
+    # Optional int8-quantized ONNX export of the emotion classifier
+    ONNX_MODEL_PATH = os.getenv('ONNX_MODEL_PATH', os.path.join('models', 'emotion_int8.onnx'))
     
     # Text limits
     MAX_TEXT_LENGTH = int(os.getenv('MAX_TEXT_LENGTH', '1000'))
 
+    # Below this length, ensemble mode skips the transformer: VADER labels
+    # very short texts just as well at a fraction of the cost
+    HF_MIN_TEXT_LENGTH = int(os.getenv('HF_MIN_TEXT_LENGTH', '20'))
+
+# --- ONNX Emotion Classifier ---
+class OnnxEmotionClassifier:
+    """Int8 ONNX Runtime drop-in for the HF text-classification pipeline.
+
+    Produce the model once with:
+        optimum-cli export onnx --model j-hartmann/emotion-english-distilroberta-base \\
+            --task text-classification models/emotion_fp32/
+        python -c "from onnxruntime.quantization import quantize_dynamic, QuantType; \\
+            quantize_dynamic('models/emotion_fp32/model.onnx', \\
+            'models/emotion_int8.onnx', weight_type=QuantType.QInt8)"
+
+    Mimics the pipeline's [{label, score}] output shape (one dict per text
+    for list input), so callers and the micro-batcher are unchanged.
+    """
+    LABELS = ['anger', 'disgust', 'fear', 'joy', 'neutral', 'sadness', 'surprise']
+
+    def __init__(self, model_path):
+        self.session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            'j-hartmann/emotion-english-distilroberta-base'
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def __call__(self, texts):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=512, return_tensors='np'
+        )
+        feeds = {k: v.astype(np.int64) for k, v in encoded.items() if k in self._input_names}
+        logits = self.session.run(None, feeds)[0]
+
+        # Softmax over logits, stabilized against overflow
+        shifted = logits - logits.max(axis=-1, keepdims=True)
+        probs = np.exp(shifted)
+        probs /= probs.sum(axis=-1, keepdims=True)
+
+        results = [
+            {'label': self.LABELS[int(row.argmax())], 'score': float(row.max())}
+            for row in probs
+        ]
+        return results[0] if single else results
+
 # --- Initialize Clients ---
 def initialize_clients():
     clients = {}
@@ -82,9 +226,21 @@ def initialize_clients():
         except Exception as e:
             print(f"Google Cloud TTS initialization failed: {e}")
     
-    # Hugging Face Pipeline
-    if HF_AVAILABLE:
+    # Emotion classifier: prefer the int8 ONNX export (no torch at runtime),
+    # fall back to the FP32 HF pipeline
+    if ONNX_AVAILABLE and HF_AVAILABLE and os.path.exists(Config.ONNX_MODEL_PATH):
         try:
+            clients['emotion_classifier'] = OnnxEmotionClassifier(Config.ONNX_MODEL_PATH)
+            print(f"ONNX int8 emotion classifier initialized from {Config.ONNX_MODEL_PATH}")
+        except Exception as e:
+            print(f"Could not load ONNX model: {e}")
+
+    if HF_AVAILABLE and 'emotion_classifier' not in clients:
+        try:
+            # Keep torch's intra-op pool in line with Flask worker concurrency
+            import torch
+            torch.set_num_threads(min(4, os.cpu_count() or 1))
+
             clients['emotion_classifier'] = pipeline(
                 "text-classification",
                 model="j-hartmann/emotion-english-distilroberta-base",
@@ -93,58 +249,152 @@ def initialize_clients():
             print("Hugging Face emotion classifier initialized")
         except Exception as e:
             print(f"Could not load Hugging Face model: {e}")
-    
+
+    # Warm the classifier so the first real request doesn't pay the
+    # lazy-init/kernel JIT cost (can be several seconds)
+    if 'emotion_classifier' in clients:
+        try:
+            clients['emotion_classifier']("warmup")
+            print("Emotion classifier warmed up")
+        except Exception as e:
+            print(f"Emotion classifier warmup failed: {e}")
+
     return clients
 
 clients = initialize_clients()
 
+# --- Micro-Batching for the Emotion Classifier ---
+class BatchedClassifier:
+    """Coalesces concurrent classification requests into single pipeline calls.
+
+    The HF pipeline accepts a list of texts natively; batching requests that
+    arrive within a short window amortizes the transformer forward pass
+    across them instead of serializing one call per HTTP request.
+    """
+    MAX_BATCH_SIZE = 16
+    MAX_WAIT_SECONDS = 0.008
+    # Texts in one sub-batch may differ in length by at most this factor;
+    # tighter grouping means fewer pad tokens per forward pass
+    MAX_LENGTH_RATIO = 1.3
+
+    def __init__(self, classifier):
+        self.classifier = classifier
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        """Queue a text for classification; returns a Future with the result"""
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _drain(self):
+        """Block for one item, then grab whatever else arrives in the window"""
+        batch = [self._queue.get()]
+        while len(batch) < self.MAX_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get(timeout=self.MAX_WAIT_SECONDS))
+            except queue.Empty:
+                break
+        return batch
+
+    def _length_buckets(self, batch):
+        """Split a batch into groups of similar-length texts.
+
+        Classifying mixed-length texts together pads everything to the
+        longest item; grouping by length keeps pad-token waste bounded by
+        MAX_LENGTH_RATIO per group.
+        """
+        ordered = sorted(batch, key=lambda item: len(item[0]))
+        groups = []
+        group = [ordered[0]]
+        min_len = max(len(ordered[0][0]), 1)
+        for item in ordered[1:]:
+            if len(item[0]) / min_len < self.MAX_LENGTH_RATIO:
+                group.append(item)
+            else:
+                groups.append(group)
+                group = [item]
+                min_len = max(len(item[0]), 1)
+        groups.append(group)
+        return groups
+
+    def _run(self):
+        while True:
+            batch = self._drain()
+            for group in self._length_buckets(batch):
+                try:
+                    results = self.classifier([text for text, _ in group])
+                    for (_, future), result in zip(group, results):
+                        future.set_result(result)
+                except Exception as e:
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+
+emotion_batcher = None
+if 'emotion_classifier' in clients:
+    emotion_batcher = BatchedClassifier(clients['emotion_classifier'])
+    print("Emotion classifier micro-batching enabled")
+
 # --- Initialize Flask App ---
 app = Flask(__name__)
 
+# Serialize JSON responses with orjson when available (2-5x faster than
+# stdlib json on the nested float dicts in emotion_scores/all_analyses)
+if ORJSON_AVAILABLE:
+    try:
+        from flask.json.provider import DefaultJSONProvider
+
+        class OrjsonProvider(DefaultJSONProvider):
+            def dumps(self, obj, **kwargs):
+                return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+            def loads(self, s, **kwargs):
+                return orjson.loads(s)
+
+        app.json = OrjsonProvider(app)
+        print("orjson JSON provider enabled")
+    except ImportError:
+        print("Flask JSON provider API not available; using default json")
+
 # --- Enhanced Emotion Analysis Engine ---
+# Shared pool for running the independent ensemble engines in parallel
+_ENSEMBLE_POOL = ThreadPoolExecutor(max_workers=3)
+
+_VADER_ANALYZER = SentimentIntensityAnalyzer()
+
+# Both scorers are deterministic per text, so repeated inputs (demos,
+# tests, retries) skip the pure-Python tokenization + lexicon lookups.
+# Bounded by MAX_TEXT_LENGTH, 1024 entries stay small.
+@functools.lru_cache(maxsize=1024)
+def _vader_scores(text):
+    return _VADER_ANALYZER.polarity_scores(text)
+
+@functools.lru_cache(maxsize=1024)
+def _textblob_sentiment(text):
+    return TextBlob(text).sentiment
+
 class EmotionAnalyzer:
     def __init__(self):
-        self.vader_analyzer = SentimentIntensityAnalyzer()
-    
+        self.vader_analyzer = _VADER_ANALYZER
+
     def analyze_vader(self, text):
         """VADER sentiment analysis"""
-        sentiment = self.vader_analyzer.polarity_scores(text)
-        compound = sentiment['compound']
-        
-        if compound >= 0.6:
-            emotion = "Very Positive"
-        elif compound >= 0.2:
-            emotion = "Positive"
-        elif compound >= 0.05:
-            emotion = "Slightly Positive"
-        elif compound <= -0.6:
-            emotion = "Very Negative"
-        elif compound <= -0.2:
-            emotion = "Negative"
-        elif compound <= -0.05:
-            emotion = "Slightly Negative"
-        else:
-            emotion = "Neutral"
-        
-        return {
-            'engine': 'VADER',
-            'emotion': emotion,
-            'confidence': abs(compound),
-            'scores': {
-                'compound': round(compound, 3),
-                'positive': round(sentiment['pos'], 3),
-                'negative': round(sentiment['neg'], 3),
-                'neutral': round(sentiment['neu'], 3)
-            }
-        }
-    
+        sentiment = _vader_scores(text)
+        return vader_result(sentiment)
+
     def analyze_huggingface(self, text):
         """Hugging Face emotion classification"""
-        if not HF_AVAILABLE or 'emotion_classifier' not in clients:
+        if not HF_AVAILABLE or emotion_batcher is None:
             return None
-        
+
         try:
-            results = clients['emotion_classifier'](text)
+            result = emotion_batcher.submit(text).result(timeout=5)
+            # Batched list input yields one dict per text; keep the old
+            # single-text shape of a list of score dicts
+            results = result if isinstance(result, list) else [result]
             top_emotion = results[0]
             
             # Map HF emotions to our categories
@@ -168,7 +418,7 @@ class EmotionAnalyzer:
                 'all_scores': results
             }
         except Exception as e:
-            print(f"Hugging Face analysis failed: {e}")
+            logger.warning(f"Hugging Face analysis failed: {e}")
             return None
     
     def analyze_textblob(self, text):
@@ -177,36 +427,10 @@ class EmotionAnalyzer:
             return None
         
         try:
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity
-            subjectivity = blob.sentiment.subjectivity
-            
-            if polarity >= 0.5:
-                emotion = "Very Positive"
-            elif polarity >= 0.1:
-                emotion = "Positive"
-            elif polarity >= 0.05:
-                emotion = "Slightly Positive"
-            elif polarity <= -0.5:
-                emotion = "Very Negative"
-            elif polarity <= -0.1:
-                emotion = "Negative"
-            elif polarity <= -0.05:
-                emotion = "Slightly Negative"
-            else:
-                emotion = "Neutral"
-            
-            return {
-                'engine': 'TextBlob',
-                'emotion': emotion,
-                'confidence': abs(polarity),
-                'scores': {
-                    'polarity': round(polarity, 3),
-                    'subjectivity': round(subjectivity, 3)
-                }
-            }
+            sentiment = _textblob_sentiment(text)
+            return textblob_result(sentiment.polarity, sentiment.subjectivity)
         except Exception as e:
-            print(f"TextBlob analysis failed: {e}")
+            logger.warning(f"TextBlob analysis failed: {e}")
             return None
     
     def analyze(self, text):
@@ -222,13 +446,21 @@ class EmotionAnalyzer:
             tb_result = self.analyze_textblob(text)
             results['primary'] = tb_result if tb_result else self.analyze_vader(text)
         elif Config.EMOTION_ENGINE == 'ensemble':
-            # Run all available engines
-            results['vader'] = self.analyze_vader(text)
-            if HF_AVAILABLE:
-                results['huggingface'] = self.analyze_huggingface(text)
-            if TEXTBLOB_AVAILABLE:
-                results['textblob'] = self.analyze_textblob(text)
-            
+            # Run all available engines concurrently; ensemble latency is
+            # max(engines) instead of their sum
+            # Short texts don't justify a transformer forward pass
+            use_hf = HF_AVAILABLE and len(text) >= Config.HF_MIN_TEXT_LENGTH
+
+            vader_future = _ENSEMBLE_POOL.submit(self.analyze_vader, text)
+            hf_future = _ENSEMBLE_POOL.submit(self.analyze_huggingface, text) if use_hf else None
+            tb_future = _ENSEMBLE_POOL.submit(self.analyze_textblob, text) if TEXTBLOB_AVAILABLE else None
+
+            results['vader'] = vader_future.result()
+            if hf_future is not None:
+                results['huggingface'] = hf_future.result()
+            if tb_future is not None:
+                results['textblob'] = tb_future.result()
+
             # Use Hugging Face as primary if available, otherwise VADER
             if 'huggingface' in results and results['huggingface']:
                 results['primary'] = results['huggingface']
@@ -238,53 +470,152 @@ class EmotionAnalyzer:
         return results
 
 # --- Multi-Engine TTS System ---
+# Voice settings per engine and emotion, built once at import; read-only so
+# lookups never allocate and callers can't mutate shared state
+_VOICE_MAPPINGS = MappingProxyType({
+    'gtts': {
+        'Very Positive': {'tld': 'com.au', 'slow': False},  # Australian - upbeat
+        'Positive': {'tld': 'co.uk', 'slow': False},        # British - pleasant
+        'Slightly Positive': {'tld': 'ca', 'slow': False},  # Canadian - friendly
+        'Neutral': {'tld': 'com', 'slow': False},           # US - standard
+        'Slightly Negative': {'tld': 'co.in', 'slow': False}, # Indian - thoughtful
+        'Negative': {'tld': 'co.za', 'slow': True},         # South African - slower
+        'Very Negative': {'tld': 'com', 'slow': True}       # US - slow and somber
+    },
+    'google_cloud': {
+        'Very Positive': ('en-US-Wavenet-H', 'FEMALE'),
+        'Positive': ('en-US-Wavenet-C', 'FEMALE'),
+        'Slightly Positive': ('en-US-Wavenet-E', 'MALE'),
+        'Neutral': ('en-US-Wavenet-D', 'MALE'),
+        'Slightly Negative': ('en-US-Wavenet-B', 'MALE'),
+        'Negative': ('en-US-Wavenet-A', 'MALE'),
+        'Very Negative': ('en-US-Wavenet-I', 'MALE')
+    },
+    'pyttsx3': {
+        'Very Positive': {'rate': 200, 'volume': 1.0},
+        'Positive': {'rate': 180, 'volume': 0.9},
+        'Slightly Positive': {'rate': 170, 'volume': 0.8},
+        'Neutral': {'rate': 160, 'volume': 0.7},
+        'Slightly Negative': {'rate': 140, 'volume': 0.6},
+        'Negative': {'rate': 130, 'volume': 0.5},
+        'Very Negative': {'rate': 120, 'volume': 0.4}
+    },
+    'macos_say': {
+        'Very Positive': {'voice': 'Samantha', 'rate': 200},
+        'Positive': {'voice': 'Kathy', 'rate': 180},
+        'Slightly Positive': {'voice': 'Alex', 'rate': 170},
+        'Neutral': {'voice': 'Alex', 'rate': 160},
+        'Slightly Negative': {'voice': 'Tom', 'rate': 140},
+        'Negative': {'voice': 'Ralph', 'rate': 130},
+        'Very Negative': {'voice': 'Fred', 'rate': 120}
+    }
+})
+
 class TTSEngine:
+    # Cache tuning: in-memory LRU size and how often stale files are evicted
+    CACHE_MAX_ENTRIES = 512
+    CACHE_EVICT_INTERVAL = 3600  # seconds
+    CACHE_MAX_AGE = 24 * 3600    # seconds
+
     def __init__(self):
-        self.output_dir = os.path.join('static', 'audio')
+        # Absolute path so downstream joins skip per-call cwd resolution
+        self.output_dir = os.path.abspath(os.path.join('static', 'audio'))
         os.makedirs(self.output_dir, exist_ok=True)
-    
+
+        # In-memory LRU of recently served cache keys (hit tracking only;
+        # the audio files on disk are the real cache)
+        self._cache_lru = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._schedule_cache_eviction()
+
+        # pyttsx3 engines are not thread-safe, so keep one per thread
+        # instead of paying driver init (~100-300 ms) on every call
+        self._pyttsx3_local = threading.local()
+
+        # Synthesis runs on its own bounded pool so TTS back-pressure is
+        # independent of the web worker pool; in-flight futures are shared
+        # per filename so concurrent identical requests synthesize once
+        self._synth_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='tts')
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+        # Warm worker pool for macOS 'say' invocations. 'say -o' is one-shot
+        # per output file (no mid-stream voice changes), so the process
+        # itself can't persist; the pool keeps dispatch threads warm and
+        # bounds how many Core Audio sessions run at once.
+        self._say_pool = None
+        if sys.platform == 'darwin':
+            self._say_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='say')
+
+    def _cache_key(self, text, emotion, engine, voice_settings):
+        """Deterministic key for a (text, emotion, engine, voice) combination"""
+        payload = f"{text}|{emotion}|{engine}|{voice_settings}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _engine_filename(self, text, emotion, engine):
+        """Deterministic output filename for a specific engine"""
+        voice_settings = self.get_voice_for_emotion(emotion, engine)
+        return f"tts_{self._cache_key(text, emotion, engine, voice_settings)}.mp3"
+
+    def cache_filename(self, text, emotion):
+        """Deterministic output filename so identical requests reuse audio"""
+        return self._engine_filename(text, emotion, Config.TTS_ENGINE)
+
+    def _cache_lookup(self, filename):
+        """Return a cached audio URL if this file was already synthesized"""
+        filepath = os.path.join(self.output_dir, filename)
+        if not os.path.exists(filepath):
+            # macOS say saves .m4a instead of .mp3; match that variant too
+            # so the same content hash deduplicates across engines
+            m4a_filename = filename[:-4] + '.m4a' if filename.endswith('.mp3') else None
+            if m4a_filename and os.path.exists(os.path.join(self.output_dir, m4a_filename)):
+                filename = m4a_filename
+                filepath = os.path.join(self.output_dir, filename)
+            else:
+                return None
+
+        # Refresh mtime so hot entries keep surviving the stale-file sweep
+        try:
+            os.utime(filepath)
+        except OSError:
+            pass
+
+        with self._cache_lock:
+            self._cache_lru.pop(filename, None)
+            self._cache_lru[filename] = True
+            while len(self._cache_lru) > self.CACHE_MAX_ENTRIES:
+                self._cache_lru.popitem(last=False)
+
+        logger.debug(f"TTS cache hit: {filename}")
+        return url_for('static', filename=f'audio/{filename}')
+
+    def _schedule_cache_eviction(self):
+        """Periodically remove audio files that haven't been touched recently"""
+        timer = threading.Timer(self.CACHE_EVICT_INTERVAL, self._evict_stale_files)
+        timer.daemon = True
+        timer.start()
+
+    def _evict_stale_files(self):
+        import time
+        cutoff = time.time() - self.CACHE_MAX_AGE
+        try:
+            for name in os.listdir(self.output_dir):
+                if not name.startswith('tts_'):
+                    continue
+                path = os.path.join(self.output_dir, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        with self._cache_lock:
+                            self._cache_lru.pop(name, None)
+                except OSError:
+                    pass
+        finally:
+            self._schedule_cache_eviction()
+
     def get_voice_for_emotion(self, emotion, engine='gtts'):
         """Get appropriate voice based on emotion and TTS engine"""
-        voice_mappings = {
-            'gtts': {
-                'Very Positive': {'tld': 'com.au', 'slow': False},  # Australian - upbeat
-                'Positive': {'tld': 'co.uk', 'slow': False},        # British - pleasant
-                'Slightly Positive': {'tld': 'ca', 'slow': False},  # Canadian - friendly
-                'Neutral': {'tld': 'com', 'slow': False},           # US - standard
-                'Slightly Negative': {'tld': 'co.in', 'slow': False}, # Indian - thoughtful
-                'Negative': {'tld': 'co.za', 'slow': True},         # South African - slower
-                'Very Negative': {'tld': 'com', 'slow': True}       # US - slow and somber
-            },
-            'google_cloud': {
-                'Very Positive': ('en-US-Wavenet-H', 'FEMALE'),
-                'Positive': ('en-US-Wavenet-C', 'FEMALE'),
-                'Slightly Positive': ('en-US-Wavenet-E', 'MALE'),
-                'Neutral': ('en-US-Wavenet-D', 'MALE'),
-                'Slightly Negative': ('en-US-Wavenet-B', 'MALE'),
-                'Negative': ('en-US-Wavenet-A', 'MALE'),
-                'Very Negative': ('en-US-Wavenet-I', 'MALE')
-            },
-            'pyttsx3': {
-                'Very Positive': {'rate': 200, 'volume': 1.0},
-                'Positive': {'rate': 180, 'volume': 0.9},
-                'Slightly Positive': {'rate': 170, 'volume': 0.8},
-                'Neutral': {'rate': 160, 'volume': 0.7},
-                'Slightly Negative': {'rate': 140, 'volume': 0.6},
-                'Negative': {'rate': 130, 'volume': 0.5},
-                'Very Negative': {'rate': 120, 'volume': 0.4}
-            },
-            'macos_say': {
-                'Very Positive': {'voice': 'Samantha', 'rate': 200},
-                'Positive': {'voice': 'Kathy', 'rate': 180},
-                'Slightly Positive': {'voice': 'Alex', 'rate': 170},
-                'Neutral': {'voice': 'Alex', 'rate': 160},
-                'Slightly Negative': {'voice': 'Tom', 'rate': 140},
-                'Negative': {'voice': 'Ralph', 'rate': 130},
-                'Very Negative': {'voice': 'Fred', 'rate': 120}
-            }
-        }
-        
-        return voice_mappings.get(engine, {}).get(emotion, voice_mappings[engine].get('Neutral'))
+        return _VOICE_MAPPINGS.get(engine, {}).get(emotion, _VOICE_MAPPINGS[engine].get('Neutral'))
     
     def synthesize_gtts(self, text, emotion, filename):
         """Google Text-to-Speech (gTTS)"""
@@ -292,18 +623,28 @@ class TTSEngine:
             return None
         
         filepath = os.path.join(self.output_dir, filename)
-        
+
+        # Stream to a temp file and publish atomically: a mid-stream
+        # network failure must never leave a truncated file under the
+        # deterministic cache name
+        tmp_filepath = f"{filepath}.{threading.get_ident()}.tmp"
+
         try:
             voice_settings = self.get_voice_for_emotion(emotion, 'gtts')
             tld = voice_settings['tld']
             slow = voice_settings['slow']
-            
+
             tts = gTTS(text=text, lang='en', slow=slow, tld=tld)
-            tts.save(filepath)
-            print(f"gTTS: {emotion} -> TLD: {tld}, Slow: {slow}")
+            tts.save(tmp_filepath)
+            os.replace(tmp_filepath, filepath)
+            logger.debug(f"gTTS: {emotion} -> TLD: {tld}, Slow: {slow}")
             return url_for('static', filename=f'audio/{filename}')
         except Exception as e:
-            print(f"gTTS synthesis failed: {e}")
+            logger.warning(f"gTTS synthesis failed: {e}")
+            try:
+                os.remove(tmp_filepath)
+            except OSError:
+                pass
             return None
     
     def synthesize_pyttsx3(self, text, emotion, filename):
@@ -312,15 +653,18 @@ class TTSEngine:
             return None
             
         filepath = os.path.join(self.output_dir, filename)
-        
+
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            
+            # Reuse this thread's engine; init loads the platform TTS driver
+            engine = getattr(self._pyttsx3_local, 'engine', None)
+            if engine is None:
+                engine = pyttsx3.init()
+                self._pyttsx3_local.engine = engine
+
             voice_settings = self.get_voice_for_emotion(emotion, 'pyttsx3')
             engine.setProperty('rate', voice_settings['rate'])
             engine.setProperty('volume', voice_settings['volume'])
-            
+
             # Try to set appropriate voice
             voices = engine.getProperty('voices')
             if voices and len(voices) > 1:
@@ -328,16 +672,19 @@ class TTSEngine:
                     engine.setProperty('voice', voices[1].id)
                 elif 'Negative' in emotion:
                     engine.setProperty('voice', voices[0].id)
-            
-            engine.save_to_file(text, filepath)
+
+            # Write to a temp file and publish atomically so concurrent
+            # requests for the same cache key never see a partial file
+            tmp_filepath = f"{filepath}.{threading.get_ident()}.tmp"
+            engine.save_to_file(text, tmp_filepath)
             engine.runAndWait()
-            engine.stop()
-            
-            print(f"pyttsx3: {emotion} -> rate: {voice_settings['rate']}")
+            os.replace(tmp_filepath, filepath)
+
+            logger.debug(f"pyttsx3: {emotion} -> rate: {voice_settings['rate']}")
             return url_for('static', filename=f'audio/{filename}')
             
         except Exception as e:
-            print(f"pyttsx3 synthesis failed: {e}")
+            logger.warning(f"pyttsx3 synthesis failed: {e}")
             return None
     
     def synthesize_google_cloud(self, text, emotion, filename):
@@ -366,14 +713,25 @@ class TTSEngine:
             response = clients['google_cloud'].synthesize_speech(
                 input=synthesis_input, voice=voice, audio_config=audio_config
             )
-            
-            with open(filepath, "wb") as out:
-                out.write(response.audio_content)
-            
-            print(f"Google Cloud TTS: {emotion} -> {voice_name}")
+
+            # Write to a temp file and publish atomically, as in the
+            # other synthesis paths
+            tmp_filepath = f"{filepath}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_filepath, "wb") as out:
+                    out.write(response.audio_content)
+                os.replace(tmp_filepath, filepath)
+            except Exception:
+                try:
+                    os.remove(tmp_filepath)
+                except OSError:
+                    pass
+                raise
+
+            logger.debug(f"Google Cloud TTS: {emotion} -> {voice_name}")
             return url_for('static', filename=f'audio/{filename}')
         except Exception as e:
-            print(f"Google Cloud TTS synthesis failed: {e}")
+            logger.warning(f"Google Cloud TTS synthesis failed: {e}")
             return None
     
     def synthesize_macos_say(self, text, emotion, filename):
@@ -382,40 +740,63 @@ class TTSEngine:
             return None
             
         filepath = os.path.join(self.output_dir, filename)
-        
+        tmp_filepath = None
+
         try:
             voice_settings = self.get_voice_for_emotion(emotion, 'macos_say')
             voice = voice_settings['voice']
             rate = voice_settings['rate']
-            
+
             # Change extension for macOS compatibility
             if filepath.endswith('.mp3'):
                 filepath = filepath.replace('.mp3', '.m4a')
                 filename = filename.replace('.mp3', '.m4a')
-            
+
+            # Feed text via stdin (-f -) rather than argv, write to a temp
+            # file, and publish atomically once say exits cleanly. The temp
+            # name keeps the .m4a suffix because say picks the output
+            # container from the file extension.
+            tmp_filepath = f"{filepath}.{threading.get_ident()}.tmp.m4a"
             cmd = [
-                'say', '-v', voice, '-r', str(rate), '-o', filepath,
-                '--data-format=mp4f', text
+                'say', '-v', voice, '-r', str(rate), '-o', tmp_filepath,
+                '--data-format=mp4f', '-f', '-'
             ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
+
+            future = self._say_pool.submit(
+                subprocess.run, cmd, input=text, capture_output=True, text=True, timeout=30
+            )
+            result = future.result(timeout=35)
+
             if result.returncode == 0:
-                print(f"macOS say: {emotion} -> {voice} (rate: {rate})")
+                os.replace(tmp_filepath, filepath)
+                logger.debug(f"macOS say: {emotion} -> {voice} (rate: {rate})")
                 return url_for('static', filename=f'audio/{filename}')
             else:
-                print(f"macOS say failed: {result.stderr}")
+                logger.warning(f"macOS say failed: {result.stderr}")
                 return None
-                
+
         except Exception as e:
-            print(f"macOS say synthesis failed: {e}")
+            logger.warning(f"macOS say synthesis failed: {e}")
             return None
+        finally:
+            # os.replace consumed the temp file on success; on any failure
+            # path (non-zero exit, timeout, exception) remove the partial
+            if tmp_filepath is not None:
+                try:
+                    os.remove(tmp_filepath)
+                except OSError:
+                    pass
     
     def synthesize(self, text, emotion, filename):
         """Main synthesis method with fallback logic"""
         if not filename.endswith(('.mp3', '.wav', '.m4a')):
             filename = filename.rsplit('.', 1)[0] + '.mp3'
-        
+
+        # Serve previously synthesized audio straight from disk
+        cached = self._cache_lookup(filename)
+        if cached is not None:
+            return cached
+
         # Try primary TTS engine
         result = None
         if Config.TTS_ENGINE == 'gtts':
@@ -427,46 +808,112 @@ class TTSEngine:
         elif Config.TTS_ENGINE == 'macos_say':
             result = self.synthesize_macos_say(text, emotion, filename)
         
-        # Fallback logic
+        # Fallback logic. Each fallback writes under its own engine-keyed
+        # filename: publishing fallback audio under the primary engine's
+        # cache name would keep serving it for that text/emotion long
+        # after the primary engine recovers.
         if result is None:
-            print(f"Primary TTS ({Config.TTS_ENGINE}) failed, trying fallbacks...")
-            
-            # Try configured fallback
+            logger.warning(f"Primary TTS ({Config.TTS_ENGINE}) failed, trying fallbacks...")
+
+            # Configured fallback first, then anything else available
+            fallback_engines = []
             if Config.FALLBACK_TTS != Config.TTS_ENGINE:
-                if Config.FALLBACK_TTS == 'gtts':
-                    result = self.synthesize_gtts(text, emotion, filename)
-                elif Config.FALLBACK_TTS == 'pyttsx3':
-                    result = self.synthesize_pyttsx3(text, emotion, filename)
-                elif Config.FALLBACK_TTS == 'macos_say':
-                    result = self.synthesize_macos_say(text, emotion, filename)
-            
-            # Additional fallbacks
-            if result is None:
-                fallback_engines = []
-                if GTTS_AVAILABLE and Config.TTS_ENGINE != 'gtts':
-                    fallback_engines.append('gtts')
-                if sys.platform == 'darwin' and Config.TTS_ENGINE != 'macos_say':
-                    fallback_engines.append('macos_say')
-                if PYTTSX3_AVAILABLE and Config.TTS_ENGINE != 'pyttsx3':
-                    fallback_engines.append('pyttsx3')
-                
-                for engine in fallback_engines:
+                fallback_engines.append(Config.FALLBACK_TTS)
+            if GTTS_AVAILABLE and Config.TTS_ENGINE != 'gtts' and 'gtts' not in fallback_engines:
+                fallback_engines.append('gtts')
+            if sys.platform == 'darwin' and Config.TTS_ENGINE != 'macos_say' and 'macos_say' not in fallback_engines:
+                fallback_engines.append('macos_say')
+            if PYTTSX3_AVAILABLE and Config.TTS_ENGINE != 'pyttsx3' and 'pyttsx3' not in fallback_engines:
+                fallback_engines.append('pyttsx3')
+
+            for engine in fallback_engines:
+                fb_filename = self._engine_filename(text, emotion, engine)
+
+                # The primary already failed this request, so serving this
+                # engine's own cached audio is fine
+                result = self._cache_lookup(fb_filename)
+                if result is None:
                     if engine == 'gtts':
-                        result = self.synthesize_gtts(text, emotion, filename)
+                        result = self.synthesize_gtts(text, emotion, fb_filename)
                     elif engine == 'macos_say':
-                        result = self.synthesize_macos_say(text, emotion, filename)
+                        result = self.synthesize_macos_say(text, emotion, fb_filename)
                     elif engine == 'pyttsx3':
-                        result = self.synthesize_pyttsx3(text, emotion, filename)
-                    
-                    if result is not None:
-                        break
-        
+                        result = self.synthesize_pyttsx3(text, emotion, fb_filename)
+
+                if result is not None:
+                    break
+
         return result
 
+    def synthesize_async(self, text, emotion, filename):
+        """Run synthesize() on the TTS pool, sharing in-flight work.
+
+        Concurrent requests for the same deterministic filename join the
+        synthesis already in progress instead of racing to generate the
+        same audio; callers block on the returned Future.
+        """
+        # url_for inside synthesize() needs the caller's request context
+        task = self.synthesize
+        if has_request_context():
+            task = copy_current_request_context(task)
+
+        with self._inflight_lock:
+            future = self._inflight.get(filename)
+            if future is None:
+                future = self._synth_pool.submit(task, text, emotion, filename)
+                self._inflight[filename] = future
+                future.add_done_callback(lambda _: self._inflight.pop(filename, None))
+        return future
+
 # Initialize engines
 emotion_analyzer = EmotionAnalyzer()
 tts_engine = TTSEngine()
 
+# --- Precomputed Status Responses ---
+# /config and /health depend only on boot-time state, so serialize them
+# once here and serve the raw bytes instead of rebuilding per request
+def _dump_static_json(payload):
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+_CONFIG_JSON = _dump_static_json({
+    'current_config': {
+        'emotion_engine': Config.EMOTION_ENGINE,
+        'tts_engine': Config.TTS_ENGINE,
+        'fallback_tts': Config.FALLBACK_TTS,
+        'max_text_length': Config.MAX_TEXT_LENGTH
+    },
+    'available_engines': {
+        'emotion': {
+            'vader': True,
+            'huggingface': HF_AVAILABLE,
+            'textblob': TEXTBLOB_AVAILABLE
+        },
+        'tts': {
+            'gtts': GTTS_AVAILABLE,
+            'pyttsx3': PYTTSX3_AVAILABLE,
+            'google_cloud': GOOGLE_CLOUD_AVAILABLE and bool(Config.GOOGLE_CLOUD_KEY_PATH),
+            'macos_say': sys.platform == 'darwin'
+        }
+    },
+    'system_info': {
+        'platform': sys.platform,
+        'python_version': sys.version
+    }
+})
+
+_HEALTH_JSON = _dump_static_json({
+    'status': 'healthy',
+    'tts_available': any([
+        GTTS_AVAILABLE,
+        PYTTSX3_AVAILABLE,
+        sys.platform == 'darwin',
+        GOOGLE_CLOUD_AVAILABLE and bool(Config.GOOGLE_CLOUD_KEY_PATH)
+    ]),
+    'emotion_available': True
+})
+
 # --- Flask Routes ---
 @app.route('/')
 def index():
@@ -489,11 +936,13 @@ def synthesize_route():
         emotion_results = emotion_analyzer.analyze(text_input)
         primary_emotion = emotion_results['primary']
         
-        # Generate unique filename
-        unique_filename = f"output_{uuid.uuid4().hex}.mp3"
-        
-        # Synthesize speech
-        audio_url = tts_engine.synthesize(text_input, primary_emotion['emotion'], unique_filename)
+        # Deterministic filename so repeat requests hit the on-disk cache
+        output_filename = tts_engine.cache_filename(text_input, primary_emotion['emotion'])
+
+        # Synthesize speech on the dedicated TTS pool
+        audio_url = tts_engine.synthesize_async(
+            text_input, primary_emotion['emotion'], output_filename
+        ).result(timeout=60)
         
         if audio_url is None:
             return jsonify({'error': 'Failed to generate audio with any available TTS engine.'}), 500
@@ -519,53 +968,71 @@ def synthesize_route():
         return jsonify(response_data)
         
     except Exception as e:
-        print(f"Synthesis route error: {e}")
+        logger.error(f"Synthesis route error: {e}")
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
+@app.route('/synthesize_stream', methods=['POST'])
+def synthesize_stream_route():
+    """Stream audio bytes to the client as they arrive from the TTS backend.
+
+    Avoids the save-then-fetch double round-trip of /synthesize: the client
+    gets first audio bytes at roughly first-chunk time. The emotion result
+    travels in response headers since the body is raw audio.
+    """
+    data = request.get_json()
+    text_input = data.get('text')
+
+    if not text_input:
+        return jsonify({'error': 'No text provided'}), 400
+
+    if len(text_input) > Config.MAX_TEXT_LENGTH:
+        text_input = text_input[:Config.MAX_TEXT_LENGTH]
+
+    try:
+        emotion_results = emotion_analyzer.analyze(text_input)
+        primary_emotion = emotion_results['primary']
+        emotion = primary_emotion['emotion']
+
+        headers = {
+            'X-Emotion': emotion,
+            'X-Emotion-Engine': primary_emotion['engine'],
+            'X-Accel-Buffering': 'no'  # disable proxy buffering so chunks flow
+        }
+
+        if GTTS_AVAILABLE and Config.TTS_ENGINE == 'gtts':
+            voice_settings = tts_engine.get_voice_for_emotion(emotion, 'gtts')
+            tts = gTTS(text=text_input, lang='en',
+                       slow=voice_settings['slow'], tld=voice_settings['tld'])
+            return Response(tts.stream(), mimetype='audio/mpeg', headers=headers)
+
+        # Other engines synthesize to a file first; stream the saved bytes
+        # (still cached on disk for repeat requests)
+        filename = tts_engine.cache_filename(text_input, emotion)
+        audio_url = tts_engine.synthesize_async(text_input, emotion, filename).result(timeout=60)
+
+        if audio_url is None:
+            return jsonify({'error': 'Failed to generate audio with any available TTS engine.'}), 500
+
+        saved_filename = os.path.basename(audio_url)
+        filepath = os.path.join(tts_engine.output_dir, saved_filename)
+        mimetype = 'audio/mp4' if saved_filename.endswith('.m4a') else 'audio/mpeg'
+        response = send_file(filepath, mimetype=mimetype)
+        response.headers.update(headers)
+        return response
+
+    except Exception as e:
+        logger.error(f"Streaming synthesis route error: {e}")
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
 @app.route('/config')
 def get_config():
     """Configuration and status endpoint"""
-    available_engines = {
-        'emotion': {
-            'vader': True,
-            'huggingface': HF_AVAILABLE,
-            'textblob': TEXTBLOB_AVAILABLE
-        },
-        'tts': {
-            'gtts': GTTS_AVAILABLE,
-            'pyttsx3': PYTTSX3_AVAILABLE,
-            'google_cloud': GOOGLE_CLOUD_AVAILABLE and bool(Config.GOOGLE_CLOUD_KEY_PATH),
-            'macos_say': sys.platform == 'darwin'
-        }
-    }
-    
-    return jsonify({
-        'current_config': {
-            'emotion_engine': Config.EMOTION_ENGINE,
-            'tts_engine': Config.TTS_ENGINE,
-            'fallback_tts': Config.FALLBACK_TTS,
-            'max_text_length': Config.MAX_TEXT_LENGTH
-        },
-        'available_engines': available_engines,
-        'system_info': {
-            'platform': sys.platform,
-            'python_version': sys.version
-        }
-    })
+    return Response(_CONFIG_JSON, mimetype='application/json')
 
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'tts_available': any([
-            GTTS_AVAILABLE,
-            PYTTSX3_AVAILABLE,
-            sys.platform == 'darwin',
-            GOOGLE_CLOUD_AVAILABLE and bool(Config.GOOGLE_CLOUD_KEY_PATH)
-        ]),
-        'emotion_available': True
-    })
+    return Response(_HEALTH_JSON, mimetype='application/json')
 
 if __name__ == '__main__':
     print("=" * 50)
@@ -586,9 +1053,6 @@ if __name__ == '__main__':
     print(f"  - Google Cloud: {'✅' if GOOGLE_CLOUD_AVAILABLE and Config.GOOGLE_CLOUD_KEY_PATH else '❌'}")
     print("=" * 50)
     
-    # Create directories
-    os.makedirs('static/audio', exist_ok=True)
-    
     # Auto-find free port
     import socket
     
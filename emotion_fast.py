@@ -0,0 +1,61 @@
+"""Hot-path emotion bucketing and result construction.
+
+These are pure-Python float/dict operations where interpreter overhead
+dominates, so they live in a standalone strictly-typed module that can
+optionally be compiled to a C extension:
+
+    pip install mypy
+    mypyc emotion_fast.py
+
+The built extension shadows this file and app.py picks it up through the
+normal import with no code changes; the pure-Python module stays as the
+fallback when no extension is present.
+"""
+import bisect
+from typing import Any, Dict, List
+
+EMOTION_LABELS: List[str] = [
+    "Very Negative", "Negative", "Slightly Negative", "Neutral",
+    "Slightly Positive", "Positive", "Very Positive"
+]
+VADER_THRESH: List[float] = [-0.6, -0.2, -0.05, 0.05, 0.2, 0.6]
+TEXTBLOB_THRESH: List[float] = [-0.5, -0.1, -0.05, 0.05, 0.1, 0.5]
+
+
+def bucket_emotion(score: float, thresholds: List[float]) -> str:
+    """Map a sentiment score to its emotion label via binary search"""
+    idx = bisect.bisect_right(thresholds, score)
+    # Negative cutoffs are inclusive toward the stronger label
+    # (e.g. -0.6 is Very Negative), so shift left on exact ties
+    if idx and score < 0 and score == thresholds[idx - 1]:
+        idx -= 1
+    return EMOTION_LABELS[idx]
+
+
+def vader_result(sentiment: Dict[str, float]) -> Dict[str, Any]:
+    """Build the VADER analysis payload from polarity_scores output"""
+    compound = sentiment['compound']
+    return {
+        'engine': 'VADER',
+        'emotion': bucket_emotion(compound, VADER_THRESH),
+        'confidence': abs(compound),
+        'scores': {
+            'compound': round(compound, 3),
+            'positive': round(sentiment['pos'], 3),
+            'negative': round(sentiment['neg'], 3),
+            'neutral': round(sentiment['neu'], 3)
+        }
+    }
+
+
+def textblob_result(polarity: float, subjectivity: float) -> Dict[str, Any]:
+    """Build the TextBlob analysis payload from its sentiment scores"""
+    return {
+        'engine': 'TextBlob',
+        'emotion': bucket_emotion(polarity, TEXTBLOB_THRESH),
+        'confidence': abs(polarity),
+        'scores': {
+            'polarity': round(polarity, 3),
+            'subjectivity': round(subjectivity, 3)
+        }
+    }